@@ -22,7 +22,7 @@ from pydantic import BaseModel
 import asyncio
 import random
 from pipeline.db_utils import get_engine
-from pipeline.data_utils import load_sensor_data, compute_kpis, prepare_trend_data
+from pipeline.data_utils import load_sensor_data, compute_kpis, prepare_trend_data_sql
 from sqlalchemy import text
 
 # Configure logging
@@ -139,12 +139,16 @@ async def get_kpis(date: Optional[str] = Query(None, description="Date filter in
 
 
 @app.get("/api/trends", response_model=TrendResponse)
-async def get_trends(date: Optional[str] = Query(None, description="Date filter in YYYY-MM-DD format")):
+async def get_trends(
+    date: Optional[str] = Query(None, description="Date filter in YYYY-MM-DD format"),
+    points: int = Query(500, ge=1, description="Maximum number of data points to return")
+):
     """
     Get trend data for sensor visualization.
     
     Args:
         date: Optional date filter for specific date data
+        points: Maximum number of data points to return
         
     Returns:
         JSON response with trend data
@@ -153,11 +157,8 @@ async def get_trends(date: Optional[str] = Query(None, description="Date filter
         HTTPException: If data loading or trend preparation fails
     """
     try:
-        # Load data with optional date filter
-        df = load_sensor_data(TABLE_NAME, date)
-        
-        # Prepare trend data
-        trend_data = prepare_trend_data(df)
+        # Prepare trend data, averaged into at most `points` time buckets
+        trend_data = prepare_trend_data_sql(TABLE_NAME, date, max_points=points)
         
         # Prepare response
         response = TrendResponse(
@@ -278,8 +279,8 @@ async def dashboard(request: Request, date: Optional[str] = Query(None, descript
         # Compute KPIs
         kpis = compute_kpis(df)
         
-        # Prepare trend data
-        trend_data = prepare_trend_data(df)
+        # Prepare trend data, down-sampled in the database
+        trend_data = prepare_trend_data_sql(TABLE_NAME, date)
         
         # Prepare template context
         context = {
@@ -318,8 +319,8 @@ async def get_summary():
         # Compute KPIs
         kpis = compute_kpis(df)
         
-        # Prepare trend data
-        trend_data = prepare_trend_data(df)
+        # Prepare trend data, down-sampled in the database
+        trend_data = prepare_trend_data_sql(TABLE_NAME)
         
         # Get date range
         date_range = {
@@ -10,8 +10,8 @@ Version: 2.0.0
 """
 
 import http.server
-import socketserver
 import csv
+import gzip
 import json
 import os
 import sys
@@ -20,6 +20,7 @@ from typing import Dict, List, Tuple, Optional
 import webbrowser
 import time
 import threading
+import urllib.parse
 
 
 def load_demo_data(csv_path: str = "../data/simulated_processed.csv") -> Tuple[List[Dict], Dict]:
@@ -160,15 +161,13 @@ def generate_html(data: List[Dict], kpis: Dict, output_path: str = "demo_dashboa
     """
     print(f"Generating HTML dashboard at {output_path}...")
     
-    # Prepare chart data
-    timestamps = []
-    temperatures = []
-    pressures = []
-    
-    for row in data:
-        timestamps.append(row.get('timestamp', ''))
-        temperatures.append(row.get('temperature', 0))
-        pressures.append(row.get('pressure', 0))
+    # Prepare chart data as one compact columnar payload, embedded once and
+    # shared by both charts ('</' escaped so it cannot close the script tag)
+    chart_data = json.dumps({
+        'timestamps': [row.get('timestamp', '') for row in data],
+        'temperatures': [row.get('temperature', 0) for row in data],
+        'pressures': [row.get('pressure', 0) for row in data]
+    }, separators=(',', ':')).replace('</', '<\\/')
     
     # Create HTML content
     html_content = f"""<!DOCTYPE html>
@@ -379,16 +378,20 @@ def generate_html(data: List[Dict], kpis: Dict, output_path: str = "demo_dashboa
         </div>
     </div>
 
+    <script id="chart-data" type="application/json">{chart_data}</script>
     <script>
+        // Chart data is parsed once from the JSON block above
+        const chartData = JSON.parse(document.getElementById('chart-data').textContent);
+        
         // Temperature Chart
         const tempCtx = document.getElementById('temperatureChart').getContext('2d');
         const tempChart = new Chart(tempCtx, {{
             type: 'line',
             data: {{
-                labels: {json.dumps(timestamps)},
+                labels: chartData.timestamps,
                 datasets: [{{
                     label: 'Temperature (°C)',
-                    data: {json.dumps(temperatures)},
+                    data: chartData.temperatures,
                     borderColor: '#667eea',
                     backgroundColor: 'rgba(102, 126, 234, 0.1)',
                     borderWidth: 2,
@@ -452,10 +455,10 @@ def generate_html(data: List[Dict], kpis: Dict, output_path: str = "demo_dashboa
         const pressureChart = new Chart(pressureCtx, {{
             type: 'line',
             data: {{
-                labels: {json.dumps(timestamps)},
+                labels: chartData.timestamps,
                 datasets: [{{
                     label: 'Pressure (hPa)',
-                    data: {json.dumps(pressures)},
+                    data: chartData.pressures,
                     borderColor: '#28a745',
                     backgroundColor: 'rgba(40, 167, 69, 0.1)',
                     borderWidth: 2,
@@ -526,6 +529,9 @@ def generate_html(data: List[Dict], kpis: Dict, output_path: str = "demo_dashboa
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
+        # Pre-compressed copy served to clients that accept gzip
+        with open(output_path + '.gz', 'wb') as f:
+            f.write(gzip.compress(html_content.encode('utf-8')))
         print(f"HTML dashboard generated successfully: {output_path}")
         return output_path
     except Exception as e:
@@ -535,17 +541,49 @@ def generate_html(data: List[Dict], kpis: Dict, output_path: str = "demo_dashboa
 class DemoHandler(http.server.SimpleHTTPRequestHandler):
     """
     Custom HTTP request handler to serve the demo dashboard.
-    Redirects root requests to the demo dashboard HTML file.
+    Redirects root requests to the demo dashboard HTML file and serves a
+    pre-compressed .gz sibling of a file when the client accepts gzip.
     """
     
-    def do_GET(self):
-        """Handle GET requests, redirecting root to demo dashboard."""
-        if self.path == '/':
+    # Keep connections open between the page and its auto-refresh reloads
+    protocol_version = 'HTTP/1.1'
+    
+    def send_head(self):
+        """Resolve the file for GET and HEAD, redirecting root to demo dashboard."""
+        parts = urllib.parse.urlsplit(self.path)
+        if parts.path == '/':
             # Redirect root to demo dashboard
-            self.path = '/demo_dashboard.html'
-        
-        # Call parent method to serve the file
-        return super().do_GET()
+            parts = parts._replace(path='/demo_dashboard.html')
+        
+        # Per-request state; keep-alive connections reuse the handler
+        self.gzip_type = None
+        path = self.translate_path(parts.path)
+        self.gzip_variant = os.path.isfile(path + '.gz')
+        if self.gzip_variant and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            self.gzip_type = super().guess_type(path)
+            parts = parts._replace(path=parts.path + '.gz')
+        self.path = urllib.parse.urlunsplit(parts)
+        
+        return super().send_head()
+    
+    def guess_type(self, path):
+        """Report the original content type for pre-compressed files."""
+        if getattr(self, 'gzip_type', None) and path.endswith('.gz'):
+            return self.gzip_type
+        return super().guess_type(path)
+    
+    def send_response(self, code, message=None):
+        """Note whether the pre-compressed file itself is being sent."""
+        self.gzip_served = bool(getattr(self, 'gzip_type', None)) and code == 200
+        super().send_response(code, message)
+    
+    def end_headers(self):
+        """Mark pre-compressed responses and those that have a compressed variant."""
+        if getattr(self, 'gzip_served', False):
+            self.send_header('Content-Encoding', 'gzip')
+        if getattr(self, 'gzip_variant', False):
+            self.send_header('Vary', 'Accept-Encoding')
+        super().end_headers()
     
     def log_message(self, format, *args):
         """Custom logging to show requests in console."""
@@ -658,7 +696,7 @@ def main():
         
         # Start HTTP server
         try:
-            with socketserver.TCPServer(("", port), DemoHandler) as httpd:
+            with http.server.ThreadingHTTPServer(("", port), DemoHandler) as httpd:
                 print(f"🌐 Starting HTTP server on port {port}...")
                 print(f"📊 Dashboard URL: http://localhost:{port}")
                 print("🛑 Press Ctrl+C to stop the server")
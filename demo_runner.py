@@ -259,7 +259,6 @@ def generate_html(data: List[Dict], kpis: Dict) -> str:
 def start_server(html_path: str):
     """Start HTTP server"""
     import http.server
-    import socketserver
     
     # Find available port
     port = 8001
@@ -277,6 +276,8 @@ def start_server(html_path: str):
     
     # Custom handler
     class DemoHandler(http.server.SimpleHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
         def do_GET(self):
             if self.path == '/':
                 self.path = '/demo_dashboard.html'
@@ -286,7 +287,7 @@ def start_server(html_path: str):
             print(f"[{time.strftime('%H:%M:%S')}] {format % args}")
     
     # Start server
-    with socketserver.TCPServer(("", port), DemoHandler) as httpd:
+    with http.server.ThreadingHTTPServer(("", port), DemoHandler) as httpd:
         print(f"✅ Server started! Dashboard available at: http://localhost:{port}")
         print("🛑 Press Ctrl+C to stop")
         
@@ -20,24 +20,33 @@ Then open: http://localhost:8000
 """
 
 import asyncio
+import hashlib
+import importlib.util
+import io
 import json
 import logging
 import os
-import random
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 
+import numpy as np
+import orjson
 import pandas as pd
-from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 import uvicorn
 
+from pipeline.cache import LIVE_TTL, bump_version, cached, ttl_for_date
 from pipeline.db_utils import get_engine
-from pipeline.data_utils import load_sensor_data, compute_kpis, prepare_trend_data
+from pipeline.data_utils import (
+    load_sensor_data_chunks, compute_kpis_sql, prepare_trend_data_sql,
+    refresh_daily_rollup, load_daily_kpis
+)
 from sqlalchemy import text
 
 # Configure logging
@@ -48,12 +57,14 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Smart Sensor Data Dashboard",
     description="A comprehensive dashboard for industrial sensor data monitoring",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Data models
 class KPIResponse(BaseModel):
     """Response model for KPI data."""
+    model_config = ConfigDict(frozen=True)
     avg_temp: float
     avg_pressure: float
     alert_count: int
@@ -64,6 +75,7 @@ class KPIResponse(BaseModel):
 
 class TrendResponse(BaseModel):
     """Response model for trend data."""
+    model_config = ConfigDict(frozen=True)
     timestamps: List[str]
     temperatures: List[float]
     pressures: List[float]
@@ -71,67 +83,138 @@ class TrendResponse(BaseModel):
     date_filter: Optional[str] = None
     record_count: int
 
+class DashboardResponse(BaseModel):
+    """Response model for the combined KPI and trend payload."""
+    model_config = ConfigDict(frozen=True)
+    kpis: KPIResponse
+    trends: TrendResponse
+
 # Database configuration
 TABLE_NAME = "sensor_readings"
+DAILY_TABLE_NAME = "sensor_daily"
+SAMPLE_RECORDS = 100
+UPDATE_INTERVAL = 30  # Seconds between WebSocket updates
+LIVE_WINDOW = timedelta(hours=1)  # Recent data covered by WebSocket updates
+CSV_CHUNK_SIZE = 10000  # Rows per chunk when streaming CSV downloads
+
+# Prepared SQL statements, built once and reused for every call
+_CREATE_TABLE_SQL = text(f"""
+    CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        temperature REAL NOT NULL,
+        pressure REAL NOT NULL,
+        uptime INTEGER NOT NULL,
+        alert_level TEXT DEFAULT 'normal'
+    )
+""")
+_CREATE_INDEX_SQL = text(f"CREATE INDEX IF NOT EXISTS ix_sensor_ts ON {TABLE_NAME} (timestamp)")
+_CREATE_DAILY_TABLE_SQL = text(f"""
+    CREATE TABLE IF NOT EXISTS {DAILY_TABLE_NAME} (
+        day TEXT PRIMARY KEY,
+        total_records INTEGER NOT NULL,
+        avg_temp REAL,
+        min_temp REAL,
+        max_temp REAL,
+        avg_pressure REAL,
+        min_pressure REAL,
+        max_pressure REAL,
+        max_uptime INTEGER,
+        alert_count INTEGER
+    )
+""")
+_COUNT_SQL = text(f"SELECT COUNT(*) FROM {TABLE_NAME}")
+_INSERT_SQL = text(f"""
+    INSERT INTO {TABLE_NAME} (timestamp, temperature, pressure, uptime, alert_level)
+    VALUES (:timestamp, :temperature, :pressure, :uptime, :alert_level)
+""")
+_FINGERPRINT_SQL = text(f"SELECT COUNT(*), MAX(timestamp) FROM {TABLE_NAME}")
+
+# Connected WebSocket clients receiving the shared update broadcast
+_subscribers: Set[WebSocket] = set()
 
 def init_database():
     """Initialize the database with sample data."""
     engine = get_engine()
     try:
-        with engine.connect() as conn:
+        # Schema and sample data are written in a single transaction
+        with engine.begin() as conn:
             # Create table if not exists
-            conn.execute(text(f"""
-                CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    temperature REAL NOT NULL,
-                    pressure REAL NOT NULL,
-                    uptime INTEGER NOT NULL,
-                    alert_level TEXT DEFAULT 'normal'
-                )
-            """))
-            conn.commit()
+            conn.execute(_CREATE_TABLE_SQL)
+            conn.execute(_CREATE_INDEX_SQL)
+            
+            # Per-day KPI rollup for completed days
+            conn.execute(_CREATE_DAILY_TABLE_SQL)
             
             # Check if table is empty, if so populate with sample data
-            count_query = text(f"SELECT COUNT(*) FROM {TABLE_NAME}")
-            result = conn.execute(count_query).fetchone()
+            result = conn.execute(_COUNT_SQL).fetchone()
             count = result[0] if result is not None else 0
             
             if count == 0:
                 logger.info("Populating database with sample sensor data...")
                 
-                # Generate 100 sample records over the last 24 hours
+                # Generate sample records over the last 24 hours (every 15 minutes)
+                # as whole arrays, then bind them in a single executemany
+                rng = np.random.default_rng()
                 base_time = datetime.now() - timedelta(hours=24)
-                sample_data = []
-                
-                for i in range(100):
-                    timestamp = base_time + timedelta(minutes=i * 15)  # Every 15 minutes
-                    temperature = random.uniform(20, 100)
-                    pressure = random.uniform(900, 1100)
-                    uptime = random.randint(1, 100)
-                    alert_level = 'alert' if temperature > 90 or pressure > 1050 else 'normal'
-                    
-                    sample_data.append({
-                        "timestamp": timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                        "temperature": round(temperature, 2),
-                        "pressure": round(pressure, 2),
-                        "uptime": uptime,
-                        "alert_level": alert_level
-                    })
+                temperatures = rng.uniform(20, 100, SAMPLE_RECORDS)
+                pressures = rng.uniform(900, 1100, SAMPLE_RECORDS)
+                sample_data = pd.DataFrame({
+                    "timestamp": pd.date_range(base_time, periods=SAMPLE_RECORDS, freq="15min").strftime('%Y-%m-%d %H:%M:%S'),
+                    "temperature": temperatures.round(2),
+                    "pressure": pressures.round(2),
+                    "uptime": rng.integers(1, 101, SAMPLE_RECORDS),
+                    "alert_level": np.where((temperatures > 90) | (pressures > 1050), 'alert', 'normal')
+                }).to_dict("records")
                 
-                insert_query = text(f"""
-                    INSERT INTO {TABLE_NAME} (timestamp, temperature, pressure, uptime, alert_level)
-                    VALUES (:timestamp, :temperature, :pressure, :uptime, :alert_level)
-                """)
-                conn.execute(insert_query, sample_data)
-                conn.commit()
+                conn.execute(_INSERT_SQL, sample_data)
                 logger.info(f"Added {len(sample_data)} sample records to database")
             else:
                 logger.info(f"Database already contains {count} records. Skipping sample data population.")
+        
+        bump_version()
+        days = refresh_daily_rollup(TABLE_NAME, DAILY_TABLE_NAME)
+        logger.info(f"Daily rollup contains {days} completed days")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to initialize database: {str(e)}")
 
+@cached(ttl=ttl_for_date, name="kpis")
+def _load_kpis(date: Optional[str]) -> Dict[str, Any]:
+    """Compute KPIs for a date filter in the database, cached per filter."""
+    # Completed days are served from the rollup when they have been stored
+    if date and date < datetime.now().strftime('%Y-%m-%d'):
+        kpis = load_daily_kpis(DAILY_TABLE_NAME, date)
+        if kpis is not None:
+            return kpis
+    return compute_kpis_sql(TABLE_NAME, date)
+
+@cached(ttl=ttl_for_date, name="trends")
+def _load_trends(date: Optional[str], points: int) -> Dict[str, Any]:
+    """Aggregate trend data for a date filter, cached per filter and size."""
+    return prepare_trend_data_sql(TABLE_NAME, date, max_points=points)
+
+@cached(ttl=LIVE_TTL, name="fingerprint")
+def _data_fingerprint() -> str:
+    """Summarize the table contents; changes whenever rows are added or removed."""
+    with get_engine().connect() as conn:
+        count, latest = conn.execute(_FINGERPRINT_SQL).one()
+    return f"{count}:{latest}"
+
+async def _check_not_modified(request: Request, response: Response) -> Optional[Response]:
+    """Set ETag/Cache-Control headers and return a 304 if the client's copy is current."""
+    fingerprint = await run_in_threadpool(_data_fingerprint)
+    digest = hashlib.blake2b(f"{fingerprint}|{request.url.path}?{request.url.query}".encode(), digest_size=16)
+    etag = f'"{digest.hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={LIVE_TTL}"}
+    
+    client_etags = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    if etag in client_etags or f"W/{etag}" in client_etags:
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
 # HTML template for the dashboard
 DASHBOARD_HTML = """
 <!DOCTYPE html>
@@ -321,23 +404,18 @@ DASHBOARD_HTML = """
         // Load data from API
         async function loadData() {
             const dateFilter = document.getElementById('dateFilter').value;
-            const url = dateFilter ? `/api/kpis?date=${dateFilter}` : '/api/kpis';
+            const url = dateFilter ? `/api/dashboard?date=${dateFilter}` : '/api/dashboard';
             
             try {
-                // Load KPIs
-                const kpiResponse = await fetch(url);
-                const kpis = await kpiResponse.json();
+                // Load KPIs and trend data in a single request
+                const response = await fetch(url);
+                const { kpis, trends } = await response.json();
                 
                 document.getElementById('avg-temp').textContent = kpis.avg_temp + '°C';
                 document.getElementById('avg-pressure').textContent = kpis.avg_pressure + ' kPa';
                 document.getElementById('alert-count').textContent = kpis.alert_count;
                 document.getElementById('uptime-hours').textContent = kpis.uptime_hours + 'h';
 
-                // Load trend data
-                const trendUrl = dateFilter ? `/api/trends?date=${dateFilter}` : '/api/trends';
-                const trendResponse = await fetch(trendUrl);
-                const trends = await trendResponse.json();
-
                 // Update charts
                 tempChart.data.labels = trends.timestamps;
                 tempChart.data.datasets[0].data = trends.temperatures;
@@ -401,11 +479,18 @@ async def dashboard():
     return HTMLResponse(content=DASHBOARD_HTML)
 
 @app.get("/api/kpis", response_model=KPIResponse)
-async def get_kpis(date: Optional[str] = Query(None, description="Date filter in YYYY-MM-DD format")):
+async def get_kpis(
+    request: Request,
+    http_response: Response,
+    date: Optional[str] = Query(None, description="Date filter in YYYY-MM-DD format")
+):
     """Get Key Performance Indicators for sensor data."""
     try:
-        df = load_sensor_data(TABLE_NAME, date)
-        kpis = compute_kpis(df)
+        not_modified = await _check_not_modified(request, http_response)
+        if not_modified:
+            return not_modified
+        
+        kpis = await run_in_threadpool(_load_kpis, date)
         
         response = KPIResponse(
             avg_temp=kpis['avg_temp'],
@@ -419,16 +504,26 @@ async def get_kpis(date: Optional[str] = Query(None, description="Date filter in
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in KPI endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/api/trends", response_model=TrendResponse)
-async def get_trends(date: Optional[str] = Query(None, description="Date filter in YYYY-MM-DD format")):
+async def get_trends(
+    request: Request,
+    http_response: Response,
+    date: Optional[str] = Query(None, description="Date filter in YYYY-MM-DD format"),
+    points: int = Query(500, ge=1, description="Maximum number of data points to return")
+):
     """Get trend data for sensor visualization."""
     try:
-        df = load_sensor_data(TABLE_NAME, date)
-        trend_data = prepare_trend_data(df)
+        not_modified = await _check_not_modified(request, http_response)
+        if not_modified:
+            return not_modified
+        
+        trend_data = await run_in_threadpool(_load_trends, date, points)
         
         response = TrendResponse(
             timestamps=trend_data['timestamps'],
@@ -441,18 +536,65 @@ async def get_trends(date: Optional[str] = Query(None, description="Date filter
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in trends endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@app.get("/api/dashboard", response_model=DashboardResponse)
+async def get_dashboard_data(
+    request: Request,
+    http_response: Response,
+    date: Optional[str] = Query(None, description="Date filter in YYYY-MM-DD format"),
+    points: int = Query(500, ge=1, description="Maximum number of data points to return")
+):
+    """Get KPIs and trend data in one response."""
+    try:
+        not_modified = await _check_not_modified(request, http_response)
+        if not_modified:
+            return not_modified
+        
+        kpis, trend_data = await asyncio.gather(
+            run_in_threadpool(_load_kpis, date),
+            run_in_threadpool(_load_trends, date, points)
+        )
+        
+        response = DashboardResponse(
+            kpis=KPIResponse(
+                avg_temp=kpis['avg_temp'],
+                avg_pressure=kpis['avg_pressure'],
+                alert_count=kpis['alert_count'],
+                uptime_hours=kpis['uptime_hours'],
+                total_records=kpis['total_records'],
+                date_filter=date,
+                timestamp=datetime.now().isoformat()
+            ),
+            trends=TrendResponse(
+                timestamps=trend_data['timestamps'],
+                temperatures=trend_data['temperatures'],
+                pressures=trend_data['pressures'],
+                uptime_hours=trend_data['uptime_hours'],
+                date_filter=date,
+                record_count=trend_data['record_count']
+            )
+        )
+        
+        return response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in dashboard endpoint: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 @app.get("/api/health")
-async def health_check():
+def health_check():
     """Health check endpoint for monitoring."""
     try:
         engine = get_engine()
         with engine.connect() as conn:
-            count_query = text(f"SELECT COUNT(*) FROM {TABLE_NAME}")
-            result = conn.execute(count_query).fetchone()
+            result = conn.execute(_COUNT_SQL).fetchone()
             record_count = result[0] if result is not None else 0
         
         return {
@@ -476,50 +618,105 @@ async def health_check():
 async def download_csv(date: Optional[str] = Query(None, description="Date filter in YYYY-MM-DD format")):
     """Download sensor data as CSV."""
     try:
-        df = load_sensor_data(TABLE_NAME, date)
+        chunks = await run_in_threadpool(load_sensor_data_chunks, TABLE_NAME, date, CSV_CHUNK_SIZE)
         
-        # Convert DataFrame to CSV
-        csv_content = df.to_csv(index=False)
+        # Convert each chunk to CSV as it is sent, writing the header once
+        def generate_csv():
+            for i, chunk in enumerate(chunks):
+                buffer = io.StringIO()
+                chunk.to_csv(buffer, index=False, header=(i == 0))
+                yield buffer.getvalue()
         
-        from fastapi.responses import Response
-        return Response(
-            content=csv_content,
+        return StreamingResponse(
+            generate_csv(),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=sensor_data_{date or 'all'}.csv"}
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error downloading CSV: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to download CSV: {str(e)}")
 
+async def _broadcast_loop():
+    """Compute KPIs once per interval and send them to every subscriber."""
+    while True:
+        await asyncio.sleep(UPDATE_INTERVAL)
+        if not _subscribers:
+            continue
+        
+        try:
+            since = datetime.now() - LIVE_WINDOW
+            kpis = await run_in_threadpool(compute_kpis_sql, TABLE_NAME, None, since)
+        except HTTPException as e:
+            if e.status_code != 404:
+                logger.warning(f"Skipping WebSocket update: {e.detail}")
+                continue
+            # No recent readings: still send an update so clients see the feed
+            # is alive, marked so it cannot be mistaken for real readings
+            logger.debug(f"Broadcasting empty WebSocket update: {e.detail}")
+            kpis = None
+        except Exception as e:
+            logger.error(f"Error computing WebSocket update: {e}")
+            continue
+        
+        # Encode once for all clients; sent as a text frame for JSON.parse
+        message = orjson.dumps({
+            "type": "update",
+            "status": "ok" if kpis is not None else "no_data",
+            "kpis": kpis,
+            "timestamp": datetime.now().isoformat()
+        }).decode()
+        clients = list(_subscribers)
+        results = await asyncio.gather(
+            *(ws.send_text(message) for ws in clients),
+            return_exceptions=True
+        )
+        
+        # A failed send means the client has gone away
+        for ws, result in zip(clients, results):
+            if isinstance(result, Exception):
+                _subscribers.discard(ws)
+
+@app.on_event("startup")
+async def start_broadcaster():
+    """Start the shared WebSocket update task."""
+    app.state.broadcaster = asyncio.create_task(_broadcast_loop())
+
+@app.on_event("shutdown")
+async def stop_broadcaster():
+    """Stop the shared WebSocket update task."""
+    app.state.broadcaster.cancel()
+
 @app.websocket("/ws/data")
 async def websocket_data(websocket: WebSocket):
     """WebSocket endpoint for real-time data updates."""
     await websocket.accept()
+    _subscribers.add(websocket)
     try:
+        # Updates are pushed by the broadcaster; just wait for the client to leave
         while True:
-            # Send real-time data every 30 seconds
-            await asyncio.sleep(30)
-            
-            # Get latest data
-            df = load_sensor_data(TABLE_NAME)
-            kpis = compute_kpis(df)
-            
-            # Send data to client
-            await websocket.send_json({
-                "type": "update",
-                "kpis": kpis,
-                "timestamp": datetime.now().isoformat()
-            })
+            await websocket.receive_text()
             
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         await websocket.close()
+    finally:
+        _subscribers.discard(websocket)
 
 def main():
     """Main function to run the FastAPI application."""
+    # Make uvloop the default policy as well, so loops created outside of
+    # uvicorn (e.g. by an embedding launcher) use it too
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     print("🚀 Smart Sensor Data Dashboard")
     print("=" * 50)
     
@@ -534,12 +731,22 @@ def main():
     print("\nPress Ctrl+C to stop the server")
     print("=" * 50)
     
-    # Run the FastAPI application
+    # Run the FastAPI application. uvloop/httptools are used when installed
+    # (uvloop has no Windows build). A single worker by default: the
+    # WebSocket broadcaster and the response cache live in each process, so
+    # every extra WEB_CONCURRENCY worker adds its own broadcast query per
+    # tick and its own cache. WebSocket updates are small KPI messages, so
+    # per-message compression is not worth its cost.
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=False,
+        workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        access_log=False,
+        ws_per_message_deflate=False,
         log_level="info"
     )
 
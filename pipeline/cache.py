@@ -0,0 +1,94 @@
+"""
+Result Cache for Smart Sensor Dashboard
+
+Small in-process TTL cache for dashboard query results. Entries are keyed by
+a name, the call arguments and a data version that is bumped whenever new rows
+are written, so an insert invalidates every cached result at once.
+
+Author: Smart Sensor Data Dashboard Team
+Version: 2.0.0
+"""
+
+import functools
+import time
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+# Live data changes continuously; a finished day never changes again
+LIVE_TTL = 15
+HISTORICAL_TTL = 86400
+
+# Upper bound on stored entries (keys include user-supplied query values)
+MAX_ENTRIES = 256
+
+_CACHE: Dict[Tuple, Tuple[float, Any]] = {}
+_VERSION = 0
+
+
+def bump_version() -> None:
+    """Invalidate all cached results after the underlying data changed."""
+    global _VERSION
+    _VERSION += 1
+    _CACHE.clear()
+
+
+def ttl_for_date(date_filter: Optional[str], *args: Any) -> int:
+    """
+    Choose a cache lifetime for a date filter.
+
+    Args:
+        date_filter: Optional date filter in YYYY-MM-DD format
+
+    Returns:
+        Lifetime in seconds: long for days in the past, short otherwise
+    """
+    if date_filter and date_filter < date.today().isoformat():
+        return HISTORICAL_TTL
+    return LIVE_TTL
+
+
+def _evict(now: float) -> None:
+    """Drop expired entries, or everything if the cache is still full."""
+    # Snapshot the items: cached functions may run on several worker threads
+    for key in [key for key, (expiry, _) in list(_CACHE.items()) if expiry <= now]:
+        _CACHE.pop(key, None)
+    if len(_CACHE) >= MAX_ENTRIES:
+        _CACHE.clear()
+
+
+def cached(ttl: Union[int, Callable[..., int]], name: Optional[str] = None) -> Callable:
+    """
+    Cache a function's return value for a limited time.
+
+    The wrapped function must take hashable positional arguments only and its
+    result is shared between callers, so it must not be mutated.
+
+    Args:
+        ttl: Lifetime in seconds, or a callable receiving the call arguments
+            and returning the lifetime
+        name: Cache namespace, defaults to the function name
+
+    Returns:
+        Decorator applying the cache
+    """
+    def decorator(func: Callable) -> Callable:
+        namespace = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any) -> Any:
+            key = (namespace, _VERSION) + args
+            now = time.monotonic()
+            entry = _CACHE.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+            value = func(*args)
+            lifetime = ttl(*args) if callable(ttl) else ttl
+            if len(_CACHE) >= MAX_ENTRIES:
+                _evict(now)
+            _CACHE[key] = (now + lifetime, value)
+            return value
+
+        return wrapper
+
+    return decorator
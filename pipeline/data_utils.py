@@ -8,14 +8,30 @@ Author: Smart Sensor Data Dashboard Team
 Version: 2.0.0
 """
 
+import functools
+import importlib.util
+import numpy as np
 import pandas as pd
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from fastapi import HTTPException
+from sqlalchemy import TextClause, text
 
 logger = logging.getLogger(__name__)
 
+# Build query results as Arrow-backed columns when pyarrow is installed,
+# otherwise keep pandas' default NumPy dtypes
+READ_SQL_OPTIONS: Dict[str, Any] = (
+    {'dtype_backend': 'pyarrow'} if importlib.util.find_spec('pyarrow') else {}
+)
+
+
+@functools.lru_cache(maxsize=128)
+def prepared_sql(query: str) -> TextClause:
+    """Return a reusable text() statement for a SQL string, built once per string."""
+    return text(query)
+
 
 def validate_date_format(date_str: str) -> bool:
     """
@@ -34,6 +50,53 @@ def validate_date_format(date_str: str) -> bool:
         return False
 
 
+def date_filter_bounds(date_filter: str) -> Dict[str, str]:
+    """
+    Convert a date filter into half-open timestamp bounds.
+    
+    Comparing the raw timestamp column against a range (rather than wrapping
+    it in DATE()) lets the database use an index on timestamp. The bounds use
+    the same format the rows are stored in, so lexicographic comparison of
+    SQLite TEXT timestamps matches temporal order.
+    
+    Args:
+        date_filter: Date string in YYYY-MM-DD format
+        
+    Returns:
+        Dictionary with 'start' (inclusive) and 'end' (exclusive) bind parameters
+    """
+    start = datetime.strptime(date_filter, "%Y-%m-%d")
+    end = start + timedelta(days=1)
+    return {
+        "start": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "end": end.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def time_filter_clause(date_filter: Optional[str] = None,
+                       since: Optional[datetime] = None) -> Tuple[str, Dict[str, str]]:
+    """
+    Build a WHERE clause restricting rows by day and/or lower bound.
+    
+    Args:
+        date_filter: Optional date filter in YYYY-MM-DD format
+        since: Optional inclusive lower bound on the timestamp
+        
+    Returns:
+        Tuple of the WHERE clause (empty if unfiltered) and its bind parameters
+    """
+    conditions = []
+    params: Dict[str, str] = {}
+    if date_filter:
+        conditions.append("timestamp >= :start AND timestamp < :end")
+        params.update(date_filter_bounds(date_filter))
+    if since:
+        conditions.append("timestamp >= :since")
+        params["since"] = since.strftime("%Y-%m-%d %H:%M:%S")
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params
+
+
 def compute_kpis(df: pd.DataFrame) -> Dict[str, Any]:
     """
     Compute Key Performance Indicators from sensor data.
@@ -45,20 +108,27 @@ def compute_kpis(df: pd.DataFrame) -> Dict[str, Any]:
         Dictionary containing computed KPIs
     """
     try:
-        # Basic statistics
-        avg_temp = df['temperature'].mean() if 'temperature' in df.columns else 0.0
-        avg_pressure = df['pressure'].mean() if 'pressure' in df.columns else 0.0
+        # Basic statistics, computed for all numeric columns in one aggregation
+        stat_columns = [col for col in ('temperature', 'pressure', 'uptime') if col in df.columns]
+        stats = df[stat_columns].agg(['mean', 'min', 'max']).astype('float64')
+        
+        def stat(name: str, column: str, default: float = 0.0) -> float:
+            return float(stats.at[name, column]) if column in stats.columns else default
+        
+        avg_temp = stat('mean', 'temperature')
+        avg_pressure = stat('mean', 'pressure')
         total_records = len(df)
         
-        # Alert counting
-        alert_count = 0
-        if 'temperature_alert' in df.columns:
-            alert_count += (df['temperature_alert'] == 'red').sum()
-        if 'pressure_alert' in df.columns:
-            alert_count += (df['pressure_alert'] == 'red').sum()
+        # Alert counting: use the precomputed alert level when present,
+        # otherwise count red flags across both alert columns in one pass
+        if 'alert_level' in df.columns:
+            alert_count = np.count_nonzero(df['alert_level'].to_numpy(dtype=object, na_value=None) == 'alert')
+        else:
+            alert_columns = [col for col in ('temperature_alert', 'pressure_alert') if col in df.columns]
+            alert_count = np.count_nonzero(df[alert_columns].to_numpy(dtype=object, na_value=None) == 'red') if alert_columns else 0
         
         # Uptime calculation
-        uptime_hours = df['uptime'].max() if 'uptime' in df.columns else 0
+        uptime_hours = stat('max', 'uptime', 0)
         
         # Data quality metrics
         data_quality_score = 100.0  # Can be enhanced with more sophisticated metrics
@@ -71,18 +141,15 @@ def compute_kpis(df: pd.DataFrame) -> Dict[str, Any]:
             'total_records': total_records,
             'data_quality_score': data_quality_score,
             'temperature_range': {
-                'min': round(df['temperature'].min(), 2) if 'temperature' in df.columns else 0,
-                'max': round(df['temperature'].max(), 2) if 'temperature' in df.columns else 0
+                'min': round(stat('min', 'temperature', 0), 2),
+                'max': round(stat('max', 'temperature', 0), 2)
             },
             'pressure_range': {
-                'min': round(df['pressure'].min(), 2) if 'pressure' in df.columns else 0,
-                'max': round(df['pressure'].max(), 2) if 'pressure' in df.columns else 0
+                'min': round(stat('min', 'pressure', 0), 2),
+                'max': round(stat('max', 'pressure', 0), 2)
             }
         }
         
-        logger.info(f"KPIs computed: avg_temp={kpis['avg_temp']}°C, "
-                   f"alerts={kpis['alert_count']}, uptime={kpis['uptime_hours']}h")
-        
         return kpis
         
     except Exception as e:
@@ -115,17 +182,28 @@ def prepare_trend_data(df: pd.DataFrame) -> Dict[str, Any]:
         
         # Handle timestamp column - convert to datetime if it's a string
         if 'timestamp' in df.columns:
-            if df['timestamp'].dtype == 'object':  # String type
-                # Convert string timestamps to datetime
-                df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-            timestamps = df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna('Unknown').tolist()
+            col = df['timestamp']
+            if col.dtype == 'object':  # String type
+                # Frames loaded by this module are parsed at read time;
+                # convert remaining string timestamps to datetime here
+                col = pd.to_datetime(col, errors='coerce')
+            if col.dt.tz is not None:
+                col = col.dt.tz_localize(None)
+            # Format in NumPy rather than calling strftime per value
+            values = col.to_numpy(dtype='datetime64[s]')
+            formatted = np.char.replace(np.datetime_as_string(values, unit='s'), 'T', ' ')
+            timestamps = np.where(np.isnat(values), 'Unknown', formatted).tolist()
         else:
             timestamps = []
         
-        # Extract numeric data with error handling
-        temperatures = df['temperature'].round(2).fillna(0).tolist() if 'temperature' in df.columns else []
-        pressures = df['pressure'].round(2).fillna(0).tolist() if 'pressure' in df.columns else []
-        uptime_hours = df['uptime'].fillna(0).tolist() if 'uptime' in df.columns else []
+        # Extract numeric data as one float block so the NaN fill and the
+        # list conversion run over NumPy arrays rather than per-column Series
+        numeric_columns = [col for col in ('temperature', 'pressure', 'uptime') if col in df.columns]
+        values = np.nan_to_num(df[numeric_columns].to_numpy(dtype='float64'), nan=0.0)
+        columns = dict(zip(numeric_columns, values.T))
+        temperatures = columns['temperature'].round(2).tolist() if 'temperature' in columns else []
+        pressures = columns['pressure'].round(2).tolist() if 'pressure' in columns else []
+        uptime_hours = columns['uptime'].astype(int).tolist() if 'uptime' in columns else []
         
         trend_data = {
             'timestamps': timestamps,
@@ -135,7 +213,8 @@ def prepare_trend_data(df: pd.DataFrame) -> Dict[str, Any]:
             'record_count': len(df)
         }
         
-        logger.info(f"Trend data prepared: {len(timestamps)} data points")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Trend data prepared: %d data points", len(timestamps))
         return trend_data
         
     except Exception as e:
@@ -146,13 +225,15 @@ def prepare_trend_data(df: pd.DataFrame) -> Dict[str, Any]:
         )
 
 
-def load_sensor_data(table_name: str, date_filter: Optional[str] = None) -> pd.DataFrame:
+def load_sensor_data(table_name: str, date_filter: Optional[str] = None,
+                     since: Optional[datetime] = None) -> pd.DataFrame:
     """
     Load sensor data from the configured database with optional date filtering.
     
     Args:
         table_name: Name of the database table
         date_filter: Optional date filter in YYYY-MM-DD format
+        since: Optional lower bound; only rows at or after it are loaded
         
     Returns:
         DataFrame containing sensor data
@@ -162,6 +243,77 @@ def load_sensor_data(table_name: str, date_filter: Optional[str] = None) -> pd.D
     """
     from pipeline.db_utils import get_engine
     
+    engine = get_engine()
+    try:
+        # Validate date filter if provided
+        if date_filter and not validate_date_format(date_filter):
+            logger.warning(f"Invalid date format provided: {date_filter}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid date format: {date_filter}. Use YYYY-MM-DD format."
+            )
+        
+        # Build query with optional date filter and lower bound
+        where, params = time_filter_clause(date_filter, since)
+        query = f"SELECT * FROM {table_name}{where} ORDER BY timestamp"
+        df = pd.read_sql(prepared_sql(query), engine, params=params,
+                         parse_dates=['timestamp'], **READ_SQL_OPTIONS)
+        
+        if df.empty:
+            if since:
+                logger.warning(f"No data found since: {since}")
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No data found since: {since}"
+                )
+            elif date_filter:
+                logger.warning(f"No data found for date: {date_filter}")
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No data found for date: {date_filter}"
+                )
+            else:
+                logger.error("No data found in database")
+                raise HTTPException(
+                    status_code=404,
+                    detail="No data found in database. Please run the ETL pipeline first."
+                )
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Loaded %d records from database", len(df))
+        return df
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Database error in load_sensor_data: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database query failed: {str(e)}"
+        ) 
+
+def load_sensor_data_chunks(table_name: str, date_filter: Optional[str] = None,
+                            chunksize: int = 10000) -> Iterator[pd.DataFrame]:
+    """
+    Load sensor data in chunks with optional date filtering.
+    
+    The first chunk is fetched before returning so that validation and
+    empty-result errors are raised up front; the remaining chunks are read
+    from the open cursor as the iterator is consumed.
+    
+    Args:
+        table_name: Name of the database table
+        date_filter: Optional date filter in YYYY-MM-DD format
+        chunksize: Number of rows per chunk
+        
+    Returns:
+        Iterator of DataFrames containing sensor data
+        
+    Raises:
+        HTTPException: If database query fails, date format is invalid or no data is found
+    """
+    from pipeline.db_utils import get_engine
+    
     engine = get_engine()
     try:
         # Validate date filter if provided
@@ -174,13 +326,14 @@ def load_sensor_data(table_name: str, date_filter: Optional[str] = None) -> pd.D
         
         # Build query with optional date filter
         if date_filter:
-            query = f"SELECT * FROM {table_name} WHERE DATE(timestamp) = :date ORDER BY timestamp"
-            df = pd.read_sql(query, engine, params={"date": date_filter})
+            query = f"SELECT * FROM {table_name} WHERE timestamp >= :start AND timestamp < :end ORDER BY timestamp"
+            chunks = pd.read_sql(prepared_sql(query), engine, params=date_filter_bounds(date_filter), chunksize=chunksize)
         else:
             query = f"SELECT * FROM {table_name} ORDER BY timestamp"
-            df = pd.read_sql(query, engine)
+            chunks = pd.read_sql(prepared_sql(query), engine, chunksize=chunksize)
         
-        if df.empty:
+        first = next(chunks, None)
+        if first is None or first.empty:
             if date_filter:
                 logger.warning(f"No data found for date: {date_filter}")
                 raise HTTPException(
@@ -194,14 +347,323 @@ def load_sensor_data(table_name: str, date_filter: Optional[str] = None) -> pd.D
                     detail="No data found in database. Please run the ETL pipeline first."
                 )
         
-        logger.info(f"Loaded {len(df)} records from database")
-        return df
+        def iterate() -> Iterator[pd.DataFrame]:
+            yield first
+            yield from chunks
+        
+        return iterate()
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Database error in load_sensor_data: {e}")
+        logger.error(f"Database error in load_sensor_data_chunks: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database query failed: {str(e)}"
+        )
+
+def compute_kpis_sql(table_name: str, date_filter: Optional[str] = None,
+                     since: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Compute Key Performance Indicators with a single aggregate query.
+    
+    Returns the same structure as compute_kpis, but the aggregation runs in
+    the database so no rows are transferred into pandas. Alerts are counted
+    from the alert_level column of the sensor_readings schema.
+    
+    Args:
+        table_name: Name of the database table
+        date_filter: Optional date filter in YYYY-MM-DD format
+        since: Optional lower bound; only rows at or after it are aggregated
+        
+    Returns:
+        Dictionary containing computed KPIs
+        
+    Raises:
+        HTTPException: If database query fails, date format is invalid or no data is found
+    """
+    from pipeline.db_utils import get_engine
+    
+    engine = get_engine()
+    try:
+        # Validate date filter if provided
+        if date_filter and not validate_date_format(date_filter):
+            logger.warning(f"Invalid date format provided: {date_filter}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid date format: {date_filter}. Use YYYY-MM-DD format."
+            )
+        
+        query = f"""
+            SELECT
+                COUNT(*) AS total_records,
+                AVG(temperature) AS avg_temp,
+                MIN(temperature) AS min_temp,
+                MAX(temperature) AS max_temp,
+                AVG(pressure) AS avg_pressure,
+                MIN(pressure) AS min_pressure,
+                MAX(pressure) AS max_pressure,
+                MAX(uptime) AS max_uptime,
+                SUM(CASE WHEN alert_level = 'alert' THEN 1 ELSE 0 END) AS alert_count
+            FROM {table_name}
+        """
+        where, params = time_filter_clause(date_filter, since)
+        query += where
+        
+        with engine.connect() as conn:
+            row = conn.execute(prepared_sql(query), params).one()._asdict()
+        
+        if not row['total_records']:
+            if since:
+                logger.warning(f"No data found since: {since}")
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No data found since: {since}"
+                )
+            elif date_filter:
+                logger.warning(f"No data found for date: {date_filter}")
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No data found for date: {date_filter}"
+                )
+            else:
+                logger.error("No data found in database")
+                raise HTTPException(
+                    status_code=404,
+                    detail="No data found in database. Please run the ETL pipeline first."
+                )
+        
+        return {
+            'avg_temp': round(float(row['avg_temp']), 2),
+            'avg_pressure': round(float(row['avg_pressure']), 2),
+            'alert_count': int(row['alert_count'] or 0),
+            'uptime_hours': int(row['max_uptime'] or 0),
+            'total_records': int(row['total_records']),
+            'data_quality_score': 100.0,
+            'temperature_range': {
+                'min': round(float(row['min_temp']), 2),
+                'max': round(float(row['max_temp']), 2)
+            },
+            'pressure_range': {
+                'min': round(float(row['min_pressure']), 2),
+                'max': round(float(row['max_pressure']), 2)
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Database error in compute_kpis_sql: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database query failed: {str(e)}"
+        )
+
+
+def refresh_daily_rollup(table_name: str, rollup_table: str) -> int:
+    """
+    Rebuild the per-day KPI rollup for all completed days.
+    
+    Days before today never change once they are over, so their aggregates
+    are stored in the rollup table and served without scanning raw rows.
+    The current day is left out and always computed from the raw table.
+    
+    Args:
+        table_name: Name of the raw sensor data table
+        rollup_table: Name of the daily rollup table
+        
+    Returns:
+        Number of days stored in the rollup table
+    """
+    from pipeline.db_utils import get_engine
+    
+    today = datetime.now().strftime("%Y-%m-%d")
+    engine = get_engine()
+    with engine.begin() as conn:
+        conn.execute(prepared_sql(f"DELETE FROM {rollup_table} WHERE day < :today"), {"today": today})
+        result = conn.execute(prepared_sql(f"""
+            INSERT INTO {rollup_table}
+                (day, total_records, avg_temp, min_temp, max_temp,
+                 avg_pressure, min_pressure, max_pressure, max_uptime, alert_count)
+            SELECT
+                SUBSTR(timestamp, 1, 10),
+                COUNT(*),
+                AVG(temperature),
+                MIN(temperature),
+                MAX(temperature),
+                AVG(pressure),
+                MIN(pressure),
+                MAX(pressure),
+                MAX(uptime),
+                SUM(CASE WHEN alert_level = 'alert' THEN 1 ELSE 0 END)
+            FROM {table_name}
+            WHERE timestamp < :today
+            GROUP BY SUBSTR(timestamp, 1, 10)
+        """), {"today": today})
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Daily rollup refreshed: %d days", result.rowcount)
+    return result.rowcount
+
+
+def load_daily_kpis(rollup_table: str, date_filter: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up the precomputed KPIs of a completed day.
+    
+    Args:
+        rollup_table: Name of the daily rollup table
+        date_filter: Date in YYYY-MM-DD format
+        
+    Returns:
+        Dictionary containing KPIs in the compute_kpis structure, or None if
+        the day has not been rolled up
+        
+    Raises:
+        HTTPException: If database query fails or date format is invalid
+    """
+    from pipeline.db_utils import get_engine
+    
+    engine = get_engine()
+    try:
+        # Validate date filter
+        if not validate_date_format(date_filter):
+            logger.warning(f"Invalid date format provided: {date_filter}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid date format: {date_filter}. Use YYYY-MM-DD format."
+            )
+        
+        with engine.connect() as conn:
+            row = conn.execute(
+                prepared_sql(f"SELECT * FROM {rollup_table} WHERE day = :day"),
+                {"day": date_filter}
+            ).one_or_none()
+        
+        if row is None:
+            return None
+        row = row._asdict()
+        
+        return {
+            'avg_temp': round(float(row['avg_temp']), 2),
+            'avg_pressure': round(float(row['avg_pressure']), 2),
+            'alert_count': int(row['alert_count'] or 0),
+            'uptime_hours': int(row['max_uptime'] or 0),
+            'total_records': int(row['total_records']),
+            'data_quality_score': 100.0,
+            'temperature_range': {
+                'min': round(float(row['min_temp']), 2),
+                'max': round(float(row['max_temp']), 2)
+            },
+            'pressure_range': {
+                'min': round(float(row['min_pressure']), 2),
+                'max': round(float(row['max_pressure']), 2)
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Database error in load_daily_kpis: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database query failed: {str(e)}"
+        )
+
+
+def prepare_trend_data_sql(table_name: str, date_filter: Optional[str] = None,
+                           max_points: int = 500) -> Dict[str, Any]:
+    """
+    Prepare trend data by aggregating time buckets in the database.
+    
+    The time range is split into at most max_points equal-width buckets;
+    each bucket reports its first timestamp, mean temperature and pressure
+    and maximum uptime. Returns the same structure as prepare_trend_data,
+    with record_count holding the number of underlying rows.
+    
+    Args:
+        table_name: Name of the database table
+        date_filter: Optional date filter in YYYY-MM-DD format
+        max_points: Maximum number of data points to return
+        
+    Returns:
+        Dictionary containing trend data lists and metadata
+        
+    Raises:
+        HTTPException: If database query fails, date format is invalid or no data is found
+    """
+    from pipeline.db_utils import get_engine, is_postgres
+    
+    engine = get_engine()
+    try:
+        # Validate date filter if provided
+        if date_filter and not validate_date_format(date_filter):
+            logger.warning(f"Invalid date format provided: {date_filter}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid date format: {date_filter}. Use YYYY-MM-DD format."
+            )
+        
+        # Timestamps are stored as text; bucket on whole seconds since the epoch
+        if is_postgres():
+            epoch = "EXTRACT(EPOCH FROM CAST(timestamp AS TIMESTAMP))"
+            bucket = f"FLOOR(({epoch} - :first) / :width)"
+        else:
+            epoch = "CAST(strftime('%s', timestamp) AS INTEGER)"
+            bucket = f"({epoch} - :first) / :width"
+        
+        where = ""
+        params: Dict[str, Any] = {}
+        if date_filter:
+            where = " WHERE timestamp >= :start AND timestamp < :end"
+            params = date_filter_bounds(date_filter)
+        
+        with engine.connect() as conn:
+            span = conn.execute(
+                prepared_sql(f"SELECT COUNT(*) AS total_records, MIN({epoch}) AS first, MAX({epoch}) AS last FROM {table_name}{where}"),
+                params
+            ).one()._asdict()
+            
+            if not span['total_records']:
+                if date_filter:
+                    logger.warning(f"No data found for date: {date_filter}")
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"No data found for date: {date_filter}"
+                    )
+                else:
+                    logger.error("No data found in database")
+                    raise HTTPException(
+                        status_code=404,
+                        detail="No data found in database. Please run the ETL pipeline first."
+                    )
+            
+            # Width is chosen so that (last - first) / width < max_points
+            first = int(span['first'] or 0)
+            width = (int(span['last'] or 0) - first) // max_points + 1
+            query = f"""
+                SELECT
+                    MIN(timestamp) AS timestamp,
+                    AVG(temperature) AS temperature,
+                    AVG(pressure) AS pressure,
+                    MAX(uptime) AS uptime
+                FROM {table_name}{where}
+                GROUP BY {bucket}
+                ORDER BY MIN(timestamp)
+            """
+            df = pd.read_sql(
+                prepared_sql(query), conn, params={**params, 'first': first, 'width': width},
+                parse_dates=['timestamp']
+            )
+        
+        trend_data = prepare_trend_data(df)
+        trend_data['record_count'] = int(span['total_records'])
+        return trend_data
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Database error in prepare_trend_data_sql: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Database query failed: {str(e)}"
-        ) 
\ No newline at end of file
+        )
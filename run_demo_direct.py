@@ -30,9 +30,8 @@ def run_demo():
     
     # Import and run demo functions
     try:
-        from run_demo import load_demo_data, generate_html, find_available_port, open_browser
-        import http.server
-        import socketserver
+        from run_demo import load_demo_data, generate_html, find_available_port, open_browser, DemoHandler
+        from http.server import ThreadingHTTPServer
         
         # Load data
         print("📊 Loading demo data...")
@@ -50,18 +49,8 @@ def run_demo():
         # Start server
         print(f"🌐 Starting server on port {port}...")
         
-        # Custom handler to redirect root to demo
-        class DemoHandler(http.server.SimpleHTTPRequestHandler):
-            def do_GET(self):
-                if self.path == '/':
-                    self.path = '/demo_dashboard.html'
-                return super().do_GET()
-            
-            def log_message(self, format, *args):
-                print(f"[{time.strftime('%H:%M:%S')}] {format % args}")
-        
-        # Start server in background
-        with socketserver.TCPServer(("", port), DemoHandler) as httpd:
+        # Threaded server with keep-alive; DemoHandler redirects root to the demo
+        with ThreadingHTTPServer(("", port), DemoHandler) as httpd:
             print(f"✅ Server started! Dashboard available at: http://localhost:{port}")
             print("🛑 Press Ctrl+C to stop")
             
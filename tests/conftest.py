@@ -0,0 +1,55 @@
+"""
+Shared pytest configuration for the test suite.
+
+The tests can run in parallel with pytest-xdist (``pytest -n auto``). Each
+worker gets its own working directory, so the relative data and database
+paths used by the pipeline do not collide between workers. The pipeline's
+SQLite engine skips fsync during tests, since test databases need no
+durability.
+
+Author: Smart Sensor Data Dashboard Team
+Version: 1.0.0
+"""
+
+import os
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture(scope="session", autouse=True)
+def worker_directory(tmp_path_factory):
+    """Run each xdist worker in a private working directory."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker is None:
+        yield
+        return
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp(worker))
+    yield
+    os.chdir(previous)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_sqlite():
+    """Turn off synchronous writes on the pipeline's SQLite engine."""
+    try:
+        from pipeline import db_utils
+    except ImportError:
+        yield
+        return
+    if not db_utils._is_sqlite:
+        yield
+        return
+
+    def _no_sync(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.close()
+
+    event.listen(db_utils.engine, "connect", _no_sync)
+    # Pooled connections were opened without the pragma
+    db_utils.engine.dispose()
+    yield
+    event.remove(db_utils.engine, "connect", _no_sync)
+    db_utils.engine.dispose()
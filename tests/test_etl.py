@@ -17,8 +17,7 @@ import os
 import sqlite3
 import pandas as pd
 import numpy as np
-from unittest.mock import patch, MagicMock, mock_open
-from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
 import sys
 import logging
 
@@ -27,98 +26,144 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'pipeline'))
 
 # Import the ETL functions to test
 try:
-    from etl_pipeline import extract_data, transform_data, load_data, run_etl
+    import etl_pipeline
+    from pipeline import db_utils
+    from sqlalchemy import create_engine, event, text
+    from etl_pipeline import extract_data, transform_data, load_data, run_etl, run_etl_streaming
+    from etl_pipeline import run_etl_incremental, load_kpi_state, save_kpi_state, KPI_STATE_TABLE
+    _ETL_AVAILABLE = True
 except ImportError:
-    # Fallback for testing without the actual module
-    pass
+    # Fallback for testing without the actual module: the test classes are skipped
+    _ETL_AVAILABLE = False
 
+# Timestamp indexes shared by the small hand-built test frames
+_TS_5 = pd.date_range('2025-07-13', periods=5, freq='6min')
+_TS_10 = pd.date_range('2025-07-13', periods=10, freq='6min')
+_TS_50 = pd.date_range('2025-07-13', periods=50, freq='6min')
 
+# Shared in-memory SQLite database used by the integration tests
+INTEGRATION_DB_URI = 'file:integration?mode=memory&cache=shared'
+
+
+def setUpModule():
+    """Drop all log records while this module's tests run."""
+    logging.disable(logging.CRITICAL)
+
+
+def tearDownModule():
+    """Restore logging for the rest of the test session."""
+    logging.disable(logging.NOTSET)
+
+
+@unittest.skipUnless(_ETL_AVAILABLE, "etl_pipeline not importable")
 class TestETLPipeline(unittest.TestCase):
     """Test cases for the ETL pipeline functions."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the sample data and a temporary directory once per class."""
+        cls._SAMPLE = cls._create_sample_data()
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls._tmp.cleanup)
+    
     def setUp(self):
         """Set up test fixtures before each test method."""
-        # Create a temporary directory for test files
-        self.test_dir = tempfile.mkdtemp()
-        self.test_csv_path = os.path.join(self.test_dir, 'test_raw.csv')
-        self.test_db_path = os.path.join(self.test_dir, 'test_processed.db')
+        # Per-test file names inside the shared temporary directory
+        self.test_dir = self._tmp.name
+        self.test_csv_path = os.path.join(self.test_dir, f'{self._testMethodName}_raw.csv')
+        self.test_db_path = os.path.join(self.test_dir, f'{self._testMethodName}_processed.db')
+        
+        # Point the pipeline at this test's files for the whole test
+        env = patch.dict(os.environ, {
+            'DATA_PATH': self.test_csv_path,
+            'DB_PATH': self.test_db_path,
+            'TABLE_NAME': 'sensor_data'
+        })
+        env.start()
+        self.addCleanup(env.stop)
         
-        # Create sample test data
-        self.sample_data = self._create_sample_data()
+        # Re-read .env for this test and again once the patch is undone
+        etl_pipeline.clear_config_cache()
+        self.addCleanup(etl_pipeline.clear_config_cache)
         
-        # Set up logging to avoid console output during tests
-        logging.getLogger().setLevel(logging.ERROR)
+        # Shared sample test data
+        self.sample_data = self._SAMPLE
     
     def tearDown(self):
-        """Clean up test fixtures after each test method."""
-        # Remove temporary files
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        """Remove this test's files; the directory is removed with the class."""
+        for path in (self.test_csv_path, self.test_db_path):
+            if os.path.exists(path):
+                os.remove(path)
     
-    def _create_sample_data(self):
+    @staticmethod
+    def _create_sample_data():
         """Create sample sensor data for testing."""
-        # Generate 100 rows of realistic sensor data
-        timestamps = []
-        temperatures = []
-        pressures = []
-        uptimes = []
-        
-        base_time = datetime(2025, 7, 13, 0, 0, 0)
-        
-        for i in range(100):
-            timestamps.append(base_time + timedelta(minutes=6*i))
-            temperatures.append(20 + 60 * np.sin(i * 0.1) + np.random.normal(0, 5))
-            pressures.append(1000 + 50 * np.sin(i * 0.05) + np.random.normal(0, 10))
-            uptimes.append(i * 0.1)
+        # Generate 100 rows of realistic sensor data (seeded for repeatable tests)
+        rng = np.random.default_rng(0)
+        i = np.arange(100)
+        timestamps = pd.date_range('2025-07-13', periods=100, freq='6min')
+        temperatures = 20 + 60 * np.sin(i * 0.1) + rng.normal(0, 5, 100)
+        pressures = 1000 + 50 * np.sin(i * 0.05) + rng.normal(0, 10, 100)
+        uptimes = i * 0.1
         
         return pd.DataFrame({
             'timestamp': timestamps,
             'temperature': temperatures,
             'pressure': pressures,
             'uptime': uptimes
+        }, copy=False)
+    
+    def _use_test_outputs(self):
+        """Send the pipeline's database and processed files to this test's directory."""
+        engine = create_engine(f'sqlite:///{self.test_db_path}',
+                               connect_args={'check_same_thread': False})
+        self.addCleanup(engine.dispose)
+        engine_patch = patch.object(db_utils, 'engine', engine)
+        engine_patch.start()
+        self.addCleanup(engine_patch.stop)
+        
+        base = os.path.join(self.test_dir, self._testMethodName)
+        env = patch.dict(os.environ, {
+            'PROCESSED_DATA_PATH': f'{base}_processed.csv',
+            'PROCESSED_PARQUET_PATH': f'{base}_processed.parquet'
         })
+        env.start()
+        self.addCleanup(env.stop)
+        return engine
     
     def _create_test_csv(self, data=None):
         """Create a test CSV file with sample data."""
         if data is None:
             data = self.sample_data
         
-        # Add header comment
-        csv_content = "# Test sensor data\n"
-        csv_content += "timestamp,temperature,pressure,uptime\n"
-        
-        # Add data rows
-        for _, row in data.iterrows():
-            csv_content += f"{row['timestamp']},{row['temperature']:.1f},{row['pressure']:.1f},{row['uptime']:.1f}\n"
-        
+        # Add header comment, then let pandas write the rows
         with open(self.test_csv_path, 'w') as f:
-            f.write(csv_content)
+            f.write("# Test sensor data\n")
+            data.to_csv(f, index=False, float_format='%.1f', date_format='%Y-%m-%d %H:%M:%S')
     
     def test_extract_data_success(self):
         """Test successful data extraction from CSV file."""
         # Create test CSV file
         self._create_test_csv()
         
-        # Mock the environment variable to point to our test file
-        with patch.dict(os.environ, {'DATA_PATH': self.test_csv_path}):
-            # Test the extract function
-            result = extract_data()
-            
-            # Verify the result is a DataFrame
-            self.assertIsInstance(result, pd.DataFrame)
-            
-            # Verify it has the expected number of rows
-            self.assertEqual(len(result), 100)
-            
-            # Verify it has the expected columns
-            expected_columns = ['timestamp', 'temperature', 'pressure', 'uptime']
-            self.assertListEqual(list(result.columns), expected_columns)
-            
-            # Verify data types
-            self.assertTrue(pd.api.types.is_datetime64_any_dtype(result['timestamp']))
-            self.assertTrue(pd.api.types.is_numeric_dtype(result['temperature']))
-            self.assertTrue(pd.api.types.is_numeric_dtype(result['pressure']))
-            self.assertTrue(pd.api.types.is_numeric_dtype(result['uptime']))
+        # Test the extract function
+        result = extract_data()
+        
+        # Verify the result is a DataFrame
+        self.assertIsInstance(result, pd.DataFrame)
+        
+        # Verify it has the expected number of rows
+        self.assertEqual(len(result), 100)
+        
+        # Verify it has the expected columns
+        expected_columns = ['timestamp', 'temperature', 'pressure', 'uptime']
+        self.assertListEqual(list(result.columns), expected_columns)
+        
+        # Verify data types
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(result['timestamp']))
+        self.assertTrue(pd.api.types.is_numeric_dtype(result['temperature']))
+        self.assertTrue(pd.api.types.is_numeric_dtype(result['pressure']))
+        self.assertTrue(pd.api.types.is_numeric_dtype(result['uptime']))
     
     def test_extract_data_missing_file(self):
         """Test data extraction when CSV file is missing."""
@@ -137,11 +182,10 @@ class TestETLPipeline(unittest.TestCase):
         with open(self.test_csv_path, 'w') as f:
             f.write("timestamp,temperature,pressure,uptime\n")
         
-        with patch.dict(os.environ, {'DATA_PATH': self.test_csv_path}):
-            result = extract_data()
-            
-            # Should handle empty file gracefully
-            self.assertIsInstance(result, pd.DataFrame)
+        result = extract_data()
+        
+        # Should handle empty file gracefully
+        self.assertIsInstance(result, pd.DataFrame)
     
     def test_extract_data_invalid_format(self):
         """Test data extraction with invalid CSV format."""
@@ -150,11 +194,10 @@ class TestETLPipeline(unittest.TestCase):
             f.write("invalid,format,file\n")
             f.write("1,2,3\n")
         
-        with patch.dict(os.environ, {'DATA_PATH': self.test_csv_path}):
-            result = extract_data()
-            
-            # Should handle invalid format gracefully
-            self.assertIsInstance(result, pd.DataFrame)
+        result = extract_data()
+        
+        # Should handle invalid format gracefully
+        self.assertIsInstance(result, pd.DataFrame)
     
     def test_transform_data_success(self):
         """Test successful data transformation."""
@@ -174,13 +217,13 @@ class TestETLPipeline(unittest.TestCase):
         self.assertFalse(result['pressure'].isnull().any())
         self.assertFalse(result['uptime'].isnull().any())
         
-        # Verify temperature range filtering (0-150°C)
-        self.assertTrue((result['temperature'] >= 0).all())
-        self.assertTrue((result['temperature'] <= 150).all())
-        
-        # Verify pressure range filtering (800-1200 hPa)
-        self.assertTrue((result['pressure'] >= 800).all())
-        self.assertTrue((result['pressure'] <= 1200).all())
+        # Verify temperature (0-150°C) and pressure (800-1200 hPa) range filtering
+        tmin, tmax = result['temperature'].agg(['min', 'max'])
+        pmin, pmax = result['pressure'].agg(['min', 'max'])
+        self.assertGreaterEqual(tmin, 0)
+        self.assertLessEqual(tmax, 150)
+        self.assertGreaterEqual(pmin, 800)
+        self.assertLessEqual(pmax, 1200)
         
         # Verify Z-score calculation
         self.assertTrue('z_score_temp' in result.columns)
@@ -228,20 +271,22 @@ class TestETLPipeline(unittest.TestCase):
         result = transform_data(data_out_of_range)
         
         # Should filter out out-of-range values
-        self.assertTrue((result['temperature'] >= 0).all())
-        self.assertTrue((result['temperature'] <= 150).all())
-        self.assertTrue((result['pressure'] >= 800).all())
-        self.assertTrue((result['pressure'] <= 1200).all())
+        tmin, tmax = result['temperature'].agg(['min', 'max'])
+        pmin, pmax = result['pressure'].agg(['min', 'max'])
+        self.assertGreaterEqual(tmin, 0)
+        self.assertLessEqual(tmax, 150)
+        self.assertGreaterEqual(pmin, 800)
+        self.assertLessEqual(pmax, 1200)
     
     def test_transform_data_z_score_calculation(self):
         """Test Z-score calculation accuracy."""
         # Create simple test data for Z-score calculation
         simple_data = pd.DataFrame({
-            'timestamp': pd.date_range('2025-07-13', periods=5, freq='6min'),
-            'temperature': [20, 25, 30, 35, 40],
-            'pressure': [1000, 1005, 1010, 1015, 1020],
-            'uptime': [0.0, 0.1, 0.2, 0.3, 0.4]
-        })
+            'timestamp': _TS_5,
+            'temperature': np.array([20., 25., 30., 35., 40.]),
+            'pressure': np.array([1000., 1005., 1010., 1015., 1020.]),
+            'uptime': np.array([0.0, 0.1, 0.2, 0.3, 0.4])
+        }, copy=False)
         
         result = transform_data(simple_data)
         
@@ -257,11 +302,11 @@ class TestETLPipeline(unittest.TestCase):
         """Test alert detection based on Z-score."""
         # Create data with extreme values to trigger alerts
         extreme_data = pd.DataFrame({
-            'timestamp': pd.date_range('2025-07-13', periods=10, freq='6min'),
-            'temperature': [20, 25, 30, 35, 40, 45, 50, 55, 60, 100],  # Last value is extreme
-            'pressure': [1000] * 10,
-            'uptime': [i * 0.1 for i in range(10)]
-        })
+            'timestamp': _TS_10,
+            'temperature': np.array([20., 25., 30., 35., 40., 45., 50., 55., 60., 100.]),  # Last value is extreme
+            'pressure': np.full(10, 1000.),
+            'uptime': 0.1 * np.arange(10)
+        }, copy=False)
         
         result = transform_data(extreme_data)
         
@@ -282,21 +327,36 @@ class TestETLPipeline(unittest.TestCase):
         mock_conn.cursor.return_value = mock_cursor
         mock_connect.return_value = mock_conn
         
-        # Mock environment variable
-        with patch.dict(os.environ, {'DB_PATH': self.test_db_path}):
-            # Test the load function
-            result = load_data(self.sample_data)
-            
-            # Verify database operations were called
-            mock_connect.assert_called_once()
-            mock_cursor.execute.assert_called()
-            mock_conn.commit.assert_called_once()
-            mock_conn.close.assert_called_once()
-            
-            # Verify the result contains expected information
-            self.assertIsInstance(result, dict)
-            self.assertIn('records_loaded', result)
-            self.assertEqual(result['records_loaded'], len(self.sample_data))
+        # Test the load function
+        result = load_data(self.sample_data)
+        
+        # Verify database operations were called
+        mock_connect.assert_called_once()
+        mock_cursor.execute.assert_called()
+        mock_conn.commit.assert_called_once()
+        mock_conn.close.assert_called_once()
+        
+        # Verify the result contains expected information
+        self.assertIsInstance(result, dict)
+        self.assertIn('records_loaded', result)
+        self.assertEqual(result['records_loaded'], len(self.sample_data))
+    
+    def test_load_data_batches_inserts(self):
+        """Test that all rows are inserted through one executemany call."""
+        engine = create_engine('sqlite://')
+        self.addCleanup(engine.dispose)
+        inserts = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('INSERT'):
+                inserts.append((executemany, len(parameters) if executemany else 1))
+        
+        event.listen(engine, 'before_cursor_execute', record)
+        with patch.object(db_utils, 'engine', engine):
+            self.assertTrue(load_data(self.sample_data))
+        
+        # Rows go through one batched statement, not one execute per row
+        self.assertEqual(inserts, [(True, len(self.sample_data))])
     
     @patch('sqlite3.connect')
     def test_load_data_database_error(self, mock_connect):
@@ -304,13 +364,12 @@ class TestETLPipeline(unittest.TestCase):
         # Mock database connection to raise an error
         mock_connect.side_effect = sqlite3.Error("Database error")
         
-        with patch.dict(os.environ, {'DB_PATH': self.test_db_path}):
-            # Should handle database errors gracefully
-            result = load_data(self.sample_data)
-            
-            # Should return error information
-            self.assertIsInstance(result, dict)
-            self.assertIn('error', result)
+        # Should handle database errors gracefully
+        result = load_data(self.sample_data)
+        
+        # Should return error information
+        self.assertIsInstance(result, dict)
+        self.assertIn('error', result)
     
     def test_load_data_empty_dataframe(self):
         """Test data loading with empty DataFrame."""
@@ -326,101 +385,168 @@ class TestETLPipeline(unittest.TestCase):
             self.assertIsInstance(result, dict)
             self.assertEqual(result.get('records_loaded', 0), 0)
     
-    @patch('pipeline.etl_pipeline.extract_data')
-    @patch('pipeline.etl_pipeline.transform_data')
-    @patch('pipeline.etl_pipeline.load_data')
-    def test_run_etl_success(self, mock_load, mock_transform, mock_extract):
-        """Test successful ETL pipeline execution."""
-        # Mock the individual functions
-        mock_extract.return_value = self.sample_data
-        mock_transform.return_value = self.sample_data
-        mock_load.return_value = {'records_loaded': 100, 'status': 'success'}
-        
-        # Test the complete pipeline
-        result = run_etl()
-        
-        # Verify all functions were called
-        mock_extract.assert_called_once()
-        mock_transform.assert_called_once()
-        mock_load.assert_called_once()
-        
-        # Verify the result
-        self.assertIsInstance(result, dict)
-        self.assertIn('status', result)
+    def test_run_etl(self):
+        """Test ETL pipeline execution, including extraction and transformation errors."""
+        # (case, extract result or error, transform result or error, expected result key)
+        cases = [
+            ('success', self.sample_data, self.sample_data, 'status'),
+            ('extract_error', Exception("Extraction failed"), None, 'error'),
+            ('transform_error', self.sample_data, Exception("Transformation failed"), 'error'),
+        ]
+        
+        def outcome(value):
+            return {'side_effect': value} if isinstance(value, Exception) else {'return_value': value}
+        
+        for case, extracted, transformed, expected_key in cases:
+            with self.subTest(case=case), \
+                    patch('pipeline.etl_pipeline.extract_data', **outcome(extracted)) as mock_extract, \
+                    patch('pipeline.etl_pipeline.transform_data', **outcome(transformed)) as mock_transform, \
+                    patch('pipeline.etl_pipeline.load_data',
+                          return_value={'records_loaded': 100, 'status': 'success'}) as mock_load:
+                # Test the complete pipeline
+                result = run_etl()
+                
+                if case == 'success':
+                    # Verify all functions were called
+                    mock_extract.assert_called_once()
+                    mock_transform.assert_called_once()
+                    mock_load.assert_called_once()
+                
+                # Verify the result (error information for the failing steps)
+                self.assertIsInstance(result, dict)
+                self.assertIn(expected_key, result)
     
-    @patch('pipeline.etl_pipeline.extract_data')
-    def test_run_etl_extract_error(self, mock_extract):
-        """Test ETL pipeline with extraction error."""
-        # Mock extract function to raise an error
-        mock_extract.side_effect = Exception("Extraction failed")
+    def test_run_etl_streaming_matches_run_etl(self):
+        """Test that chunked processing gives the same KPIs and rows as a full run."""
+        engine = self._use_test_outputs()
+        self.sample_data.to_csv(self.test_csv_path, index=False)
         
-        # Test that the pipeline handles extraction errors
-        result = run_etl()
+        def stored_rows():
+            with engine.connect() as conn:
+                return conn.execute(text("SELECT COUNT(*) FROM sensor_data")).scalar()
         
-        # Should return error information
-        self.assertIsInstance(result, dict)
-        self.assertIn('error', result)
-    
-    @patch('pipeline.etl_pipeline.extract_data')
-    @patch('pipeline.etl_pipeline.transform_data')
-    def test_run_etl_transform_error(self, mock_transform, mock_extract):
-        """Test ETL pipeline with transformation error."""
-        # Mock functions
-        mock_extract.return_value = self.sample_data
-        mock_transform.side_effect = Exception("Transformation failed")
+        success, processed, kpis = run_etl(len(self.sample_data))
+        self.assertTrue(success)
+        full_rows = stored_rows()
         
-        # Test that the pipeline handles transformation errors
-        result = run_etl()
+        # Chunks smaller than the file, so the statistics span several chunks
+        success, streamed_kpis = run_etl_streaming(len(self.sample_data), chunksize=30)
+        self.assertTrue(success)
         
-        # Should return error information
-        self.assertIsInstance(result, dict)
-        self.assertIn('error', result)
+        self.assertEqual(stored_rows(), full_rows)
+        self.assertEqual(full_rows, len(processed))
+        self.assertEqual(streamed_kpis.keys(), kpis.keys())
+        for key, value in kpis.items():
+            self.assertAlmostEqual(streamed_kpis[key], value, places=4, msg=key)
+    
+    def test_run_etl_incremental_matches_single_transform(self):
+        """Test that two incremental batches give the KPIs of one transform over both."""
+        engine = self._use_test_outputs()
+        first, second = self.sample_data.iloc[:60], self.sample_data.iloc[60:]
+        
+        self.assertTrue(run_etl_incremental(first)[0])
+        success, _, kpis = run_etl_incremental(second)
+        self.assertTrue(success)
+        
+        # Alerts are scored against the running statistics at each batch, so
+        # only the aggregate KPIs are compared with the single pass
+        processed, expected = transform_data(self.sample_data)
+        for key in ('avg_temp', 'avg_pressure', 'uptime_hours', 'total_records'):
+            self.assertAlmostEqual(kpis[key], expected[key], places=4, msg=key)
+        
+        # The stored state holds the running moments of every valid row
+        state = load_kpi_state()
+        self.assertEqual(state['count'], len(processed))
+        self.assertAlmostEqual(np.sqrt(state['m2_t'] / (state['count'] - 1)),
+                               processed['temperature'].astype('float64').std(), places=3)
+        with engine.connect() as conn:
+            stored = conn.execute(text("SELECT COUNT(*) FROM sensor_data")).scalar()
+        self.assertEqual(stored, len(processed))
+    
+    def test_kpi_state_round_trip(self):
+        """Test that the running KPI state survives a save and load unchanged."""
+        engine = self._use_test_outputs()
+        state = {
+            'count': 42, 'mean_t': 51.25, 'm2_t': 812.5, 'mean_p': 1003.75, 'm2_p': 4096.0,
+            'max_uptime': 4.9, 'temp_red_ct': 3, 'pres_red_ct': 1, 'pres_yel_ct': 5
+        }
+        
+        self.assertTrue(save_kpi_state(state))
+        with engine.connect() as conn:
+            rows = conn.execute(text(f"SELECT COUNT(*) FROM {KPI_STATE_TABLE}")).scalar()
+        self.assertEqual(rows, 1)
+        
+        loaded = load_kpi_state()
+        self.assertEqual(loaded, state)
+        self.assertEqual({key: type(value) for key, value in loaded.items()},
+                         {key: type(value) for key, value in state.items()})
     
     def test_data_quality_checks(self):
         """Test data quality validation in transformation."""
         # Create data with various quality issues
         quality_test_data = pd.DataFrame({
-            'timestamp': pd.date_range('2025-07-13', periods=10, freq='6min'),
-            'temperature': [20, np.nan, 30, -5, 35, 200, 40, 45, 50, 55],
-            'pressure': [1000, 1005, np.nan, 1010, 500, 1015, 1500, 1020, 1025, 1030],
-            'uptime': [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
-        })
+            'timestamp': _TS_10,
+            'temperature': np.array([20., np.nan, 30., -5., 35., 200., 40., 45., 50., 55.]),
+            'pressure': np.array([1000., 1005., np.nan, 1010., 500., 1015., 1500., 1020., 1025., 1030.]),
+            'uptime': 0.1 * np.arange(10)
+        }, copy=False)
         
         result = transform_data(quality_test_data)
         
         # Should remove nulls and out-of-range values
         self.assertFalse(result['temperature'].isnull().any())
         self.assertFalse(result['pressure'].isnull().any())
-        self.assertTrue((result['temperature'] >= 0).all())
-        self.assertTrue((result['temperature'] <= 150).all())
-        self.assertTrue((result['pressure'] >= 800).all())
-        self.assertTrue((result['pressure'] <= 1200).all())
+        tmin, tmax = result['temperature'].agg(['min', 'max'])
+        pmin, pmax = result['pressure'].agg(['min', 'max'])
+        self.assertGreaterEqual(tmin, 0)
+        self.assertLessEqual(tmax, 150)
+        self.assertGreaterEqual(pmin, 800)
+        self.assertLessEqual(pmax, 1200)
         
         # Should have fewer rows than input (quality issues removed)
         self.assertLess(len(result), len(quality_test_data))
 
 
+@unittest.skipUnless(_ETL_AVAILABLE, "etl_pipeline not importable")
 class TestETLIntegration(unittest.TestCase):
     """Integration tests for the complete ETL pipeline."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory and in-memory database for the class."""
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls._tmp.cleanup)
+        
+        # The pipeline writes through db_utils.engine, so point it at the same
+        # shared in-memory database the tests query
+        engine = create_engine(
+            f'sqlite:///{INTEGRATION_DB_URI}&uri=true',
+            connect_args={'check_same_thread': False}
+        )
+        cls.addClassCleanup(engine.dispose)
+        engine_patch = patch.object(db_utils, 'engine', engine)
+        engine_patch.start()
+        cls.addClassCleanup(engine_patch.stop)
+    
     def setUp(self):
         """Set up test fixtures for integration tests."""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_csv_path = os.path.join(self.test_dir, 'test_raw.csv')
-        self.test_db_path = os.path.join(self.test_dir, 'test_processed.db')
+        self.test_dir = self._tmp.name
+        self.test_csv_path = os.path.join(self.test_dir, f'{self._testMethodName}_raw.csv')
+        # Shared in-memory database; it lives as long as self.db_conn is open
+        self.test_db_path = INTEGRATION_DB_URI
+        self.db_conn = sqlite3.connect(self.test_db_path, uri=True)
         
         # Create sample data
         self.sample_data = pd.DataFrame({
-            'timestamp': pd.date_range('2025-07-13', periods=50, freq='6min'),
+            'timestamp': _TS_50,
             'temperature': np.random.normal(30, 10, 50),
             'pressure': np.random.normal(1000, 50, 50),
             'uptime': np.arange(0, 5, 0.1)
-        })
+        }, copy=False)
     
     def tearDown(self):
         """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        self.db_conn.close()
     
     def test_end_to_end_pipeline(self):
         """Test complete ETL pipeline from CSV to database."""
@@ -440,15 +566,10 @@ class TestETLIntegration(unittest.TestCase):
             self.assertIsInstance(result, dict)
             self.assertIn('status', result)
             
-            # Verify database was created
-            self.assertTrue(os.path.exists(self.test_db_path))
-            
             # Verify data can be queried from database
-            conn = sqlite3.connect(self.test_db_path)
-            query_result = pd.read_sql_query("SELECT COUNT(*) as count FROM sensor_data", conn)
-            conn.close()
+            count = self.db_conn.execute("SELECT COUNT(*) FROM sensor_data").fetchone()[0]
             
-            self.assertGreater(query_result['count'].iloc[0], 0)
+            self.assertGreater(count, 0)
 
 
 if __name__ == '__main__':